@@ -0,0 +1,108 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled counterpart of `_count_paths_nb` from `main.py`, which avoids
+Numba's compilation on import.
+
+Build it in place with `cythonize -i _count_paths.pyx`.
+"""
+
+from libc.stdlib cimport malloc, free
+
+cdef enum:
+    NONE = 0    # Color for uncolored node.
+    RED = 1     # Color for red node.
+    BLUE = 2    # Color for blue node.
+
+
+cdef inline void _unlink(int[::1] indptr, int[::1] indices, int[::1] degree, int node, int neighbor) noexcept nogil:
+    """
+    Compiled counterpart of `Graph._unlink`.
+    """
+    cdef int start = indptr[node]
+    cdef int last = start + degree[node] - 1
+    cdef int i
+    for i in range(start, last + 1):
+        if indices[i] == neighbor:
+            indices[i] = indices[last]
+            indices[last] = neighbor
+            break
+    degree[node] -= 1
+
+
+cpdef int count_paths_c(int[::1] indptr, int[::1] indices, int[::1] degree, signed char[::1] colors, signed char[::1] alive):
+    """
+    Compiled counterpart of `Graph._count_paths_py`.
+
+    Keep in sync with `Graph._count_paths_py`, `_count_paths_nb`
+    and `_count_paths_lists` in `main.py`.
+
+        Parameters
+        ----------
+            indptr: np.ndarray
+                offsets of neighbor lists in `indices`
+            indices: np.ndarray
+                concatenated neighbor lists of all nodes
+            degree: np.ndarray
+                number of live neighbors of each node
+            colors: np.ndarray
+                color of each node
+            alive: np.ndarray
+                mask of nodes present in graph, viewed as `np.int8`
+
+        Returns
+        -------
+            number of paths connecting maximum number of pairs
+    """
+    cdef int n = degree.shape[0]
+    cdef int *leaves = <int *> malloc(n * sizeof(int))
+    if leaves == NULL:
+        raise MemoryError()
+
+    cdef int top = -1
+    cdef int paths = 0
+    cdef int v, i, start, leaf, neighbor, nbr
+    try:
+        for v in range(n):
+            if degree[v] == 1:
+                top += 1
+                leaves[top] = v
+
+        while top >= 0:
+            leaf = leaves[top]
+            top -= 1
+            if not alive[leaf]:
+                continue
+
+            alive[leaf] = 0
+            if degree[leaf] == 0:
+                # Leaf is isolated, just remove it and continue with next leaf.
+                continue
+
+            neighbor = indices[indptr[leaf]]
+            degree[leaf] = 0
+
+            if colors[leaf] + colors[neighbor] == RED + BLUE:
+                # There was a path found using edge (`leaf`, `neighbor`).
+                paths += 1
+                start = indptr[neighbor]
+                for i in range(start, start + degree[neighbor]):
+                    nbr = indices[i]
+                    if nbr != leaf:
+                        _unlink(indptr, indices, degree, nbr, neighbor)
+                        if degree[nbr] == 1:
+                            top += 1
+                            leaves[top] = nbr
+                degree[neighbor] = 0
+                alive[neighbor] = 0
+            else:
+                _unlink(indptr, indices, degree, neighbor, leaf)
+                if degree[neighbor] == 1:
+                    top += 1
+                    leaves[top] = neighbor
+                # There is not a path, push leaf's color to neighbor.
+                if colors[leaf] != NONE:
+                    colors[neighbor] = colors[leaf]
+    finally:
+        free(leaves)
+
+    return paths
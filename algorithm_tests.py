@@ -1,8 +1,9 @@
 #!/usr/bin/python3
 
+import tempfile
 import unittest
 
-from main import Graph
+from main import Graph, _count_paths_nb, _count_paths_np
 from main import NONE, RED, BLUE
 
 class AlgorithmTest(unittest.TestCase):
@@ -19,60 +20,131 @@ class AlgorithmTest(unittest.TestCase):
             set([5]),
             set([5])
         ]
-        self.assertListEqual(graph.neighbors, neighbors)
+        self.assertListEqual([ set(graph._neighbors(v).tolist()) for v in range(8) ], neighbors)
 
     def test_read_colors(self):
         graph = Graph('data_cases/case_01.in')
         colors = [NONE, RED, NONE, RED, NONE, NONE, BLUE, BLUE]
-        self.assertListEqual(graph.colors, colors)
+        self.assertListEqual(graph.colors.tolist(), colors)
+
+    def test_read_truncated(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".in") as f:
+            f.write("3 1 1\n1 2\n2 3\n")
+            f.flush()
+            with self.assertRaises(ValueError):
+                Graph(f.name)
 
     def test_get_leaves(self):
         graph = Graph('data_cases/case_01.in')
         leaves = set([1, 3, 6, 7])
-        self.assertSetEqual(graph._get_leaves(), leaves)
+        self.assertSetEqual(set(graph._get_leaves().tolist()), leaves)
 
         graph = Graph('data_cases/case_03.in')
         leaves = set([1, 2, 7, 8, 11, 12, 16, 17, 18])
-        self.assertSetEqual(graph._get_leaves(), leaves)
+        self.assertSetEqual(set(graph._get_leaves().tolist()), leaves)
 
     def test_remove_node(self):
         graph = Graph('data_cases/case_01.in')
-        graph._remove_node(1)
+        new_leaves = graph._remove_node(1)
         vertices = set([2, 3, 4, 5, 6, 7])
-        leaves = set([3, 6, 7])
         neighbors = set([3, 4])
+        self.assertListEqual(new_leaves, [])
         self.assertSetEqual(graph.nodes, vertices)
-        self.assertSetEqual(graph.leaves, leaves)
-        self.assertSetEqual(graph.neighbors[2], neighbors)
+        self.assertSetEqual(set(graph._neighbors(2).tolist()), neighbors)
 
-        graph._remove_node(3)
+        new_leaves = graph._remove_node(3)
         vertices = set([2, 4, 5, 6, 7])
-        leaves = set([2, 6, 7])
         neighbors = set([4])
+        self.assertListEqual(new_leaves, [2])
         self.assertSetEqual(graph.nodes, vertices)
-        self.assertSetEqual(graph.leaves, leaves)
-        self.assertSetEqual(graph.neighbors[2], neighbors)
+        self.assertSetEqual(set(graph._neighbors(2).tolist()), neighbors)
 
-        graph._remove_node(5)
+        new_leaves = graph._remove_node(5)
         vertices = set([2, 4, 6, 7])
-        leaves = set([2, 4, 6, 7])
         neighbors = [
             set([2]),
             set(),
             set()
             ]
+        self.assertListEqual(new_leaves, [4])
         self.assertSetEqual(graph.nodes, vertices)
-        self.assertSetEqual(graph.leaves, leaves)
-        self.assertListEqual([graph.neighbors[4], graph.neighbors[6], graph.neighbors[7]], neighbors)
+        self.assertListEqual([ set(graph._neighbors(v).tolist()) for v in [4, 6, 7] ], neighbors)
 
-    def test_cases(self):
+    def test_remove_leaf(self):
+        graph = Graph('data_cases/case_01.in')
+        new_leaf = graph._remove_leaf(6, 5)
+        vertices = set([1, 2, 3, 4, 5, 7])
+        neighbors = set([4, 7])
+        self.assertFalse(new_leaf)
+        self.assertSetEqual(graph.nodes, vertices)
+        self.assertSetEqual(set(graph._neighbors(5).tolist()), neighbors)
+
+        new_leaf = graph._remove_leaf(7, 5)
+        vertices = set([1, 2, 3, 4, 5])
+        neighbors = set([4])
+        self.assertTrue(new_leaf)
+        self.assertSetEqual(graph.nodes, vertices)
+        self.assertSetEqual(set(graph._neighbors(5).tolist()), neighbors)
+
+    def test_remove_edge_endpoints(self):
+        graph = Graph('data_cases/case_01.in')
+        new_leaves = graph._remove_edge_endpoints(6, 5)
+        vertices = set([1, 2, 3, 4, 7])
+        neighbors = [
+            set([2]),
+            set(),
+            set(),
+            set()
+            ]
+        self.assertListEqual(new_leaves, [4])
+        self.assertSetEqual(graph.nodes, vertices)
+        self.assertListEqual([ set(graph._neighbors(v).tolist()) for v in [4, 5, 6, 7] ], neighbors)
+
+    def _check_cases(self, count):
+        """
+        Checks that given function counts correct number of paths in all data cases.
+
+            Parameters
+            ----------
+                count: Callable[[Graph], int]
+                    function counting paths in given graph
+        """
         for i in range(1, 11):
             file = "data_cases/case_{:02d}.in".format(i)
             graph = Graph(file)
             with open("data_cases/case_{:02d}.out".format(i), "r") as f:
                 line = f.readline().strip()
                 correct = int(line)
-            self.assertEqual(graph.count_paths(), correct)
+            self.assertEqual(count(graph), correct, file)
+
+    def test_cases(self):
+        self._check_cases(Graph.count_paths)
+
+    def test_cases_py(self):
+        self._check_cases(Graph._count_paths_py)
+
+    def test_cases_nb(self):
+        # Kernel runs uncompiled if Numba is not imported, which is the case
+        # when compiled extension is built, `test_cases` then covers the extension.
+        self._check_cases(lambda graph: _count_paths_nb(
+            graph.indptr, graph.indices, graph.degree, graph.colors, graph.alive))
+
+    def test_long_chain_np(self):
+        # Chain is reduced from both ends, so fronts stay at two leaves.
+        n = 300000
+        with tempfile.NamedTemporaryFile("w", suffix=".in") as f:
+            f.write(f"{n - 1} {(n + 1) // 2} {n // 2}\n")
+            f.write("\n".join(f"{u} {u + 1}" for u in range(1, n)) + "\n")
+            f.write(" ".join(str(u) for u in range(1, n + 1, 2)) + "\n")
+            f.write(" ".join(str(u) for u in range(2, n + 1, 2)) + "\n")
+            f.flush()
+            graph = Graph(f.name)
+        paths = _count_paths_np(graph.indptr, graph.indices, graph.degree, graph.colors, graph.alive)
+        self.assertEqual(paths, n // 2)
+
+    def test_cases_np(self):
+        self._check_cases(lambda graph: _count_paths_np(
+            graph.indptr, graph.indices, graph.degree, graph.colors, graph.alive))
 
 def main():
     unittest.main()        
@@ -1,11 +1,27 @@
 #!/usr/bin/python3
 
 import argparse
-import fileinput
+import sys
 
-from io import TextIOWrapper
 from typing import Optional
 
+import numpy as np
+
+# Paths are counted by compiled extension if it is built, otherwise by Numba
+# kernel, otherwise in NumPy. Numba is not imported if it is not needed, as it
+# compiles its kernels on import.
+try:
+    from _count_paths import count_paths_c
+except ImportError:
+    count_paths_c = None
+
+njit = None
+if count_paths_c is None:
+    try:
+        from numba import njit
+    except ImportError:
+        pass
+
 desc =  """
         Counts maximum number of different pairs of nodes so that one node is red, other
         is blue and all pairs can be connected by mutually disjunctive paths.
@@ -20,17 +36,30 @@ NONE = 0    # Color for uncolored node.
 RED = 1     # Color for red node.
 BLUE = 2    # Color for blue node.
 
+MIN_FRONT = 1024     # Smallest front of leaves reduced at once by `_count_paths_np`.
+
 class Graph:
     """
     A class representing graph.
 
         Attributes
         ----------
+            alive: np.ndarray
+                boolean mask of nodes still present in graph, indexed by node
             nodes: set
                 nodes of graph
-            neighbors: list
-                contains sets of neighbors for each node of graph, indexed by node
-            colors: list
+            indptr: np.ndarray
+                offsets of neighbor lists in `indices` (CSR format), indexed by node
+            indices: np.ndarray
+                concatenated neighbor lists of all nodes, live neighbors of each node
+                form a prefix of its list
+            degree: np.ndarray
+                number of live neighbors of each node, indexed by node
+            leaves_buf: np.ndarray
+                stack of leaves waiting to be reduced
+            leaves_top: int
+                index of top of leaf stack, -1 if it is empty
+            colors: np.ndarray
                 contains color of each node, indexed by node
 
         Methods
@@ -48,86 +77,159 @@ class Graph:
             ----------
                 filename: Optional[str]
                     path to file describing graph or `None` if standard input should be read
-        """
-        with fileinput.input(files=filename) as input:
-            line = input.readline().strip()
-            self._M, self._R, self._B = [ int(x) for x in line.split() ]
-            self.nodes = set(range(1, self._M + 2))
-                # Number of nodes is `M+1`, indexing starts at 1.
 
-            self.neighbors = self._read_neighbors(input)
-            self.colors = self._read_colors(input)
+            Raises
+            ------
+                ValueError
+                    if input does not contain as many numbers as its header declares
+        """
+        if filename is None:
+            data = sys.stdin.buffer.read()
+        else:
+            with open(filename, "rb") as input:
+                data = input.read()
+
+        # Whole input is parsed at once, lines only separate the header,
+        # edges and colored nodes, whose counts are given in the header.
+        tokens = np.fromstring(data, dtype=np.int32, sep=" ")
+        if len(tokens) < 3:
+            raise ValueError("Input does not start with numbers of edges, red and blue nodes.")
+        self._M, self._R, self._B = tokens[:3].tolist()
+        expected = 3 + 2 * self._M + self._R + self._B
+        if len(tokens) != expected:
+            raise ValueError(f"Input contains {len(tokens)} numbers, header declares {expected}.")
+        self.alive = np.ones(self._M + 2, dtype=np.bool_)
+        self.alive[0] = False
+            # Number of nodes is `M+1`, indexing starts at 1.
+
+        edges_end = 3 + 2 * self._M
+        red_end = edges_end + self._R
+        self.indptr, self.indices = self._read_neighbors(tokens[3:edges_end])
+        self.colors = self._read_colors(tokens[edges_end:red_end], tokens[red_end:red_end + self._B])
+
+        self.degree = self.indptr[1:] - self.indptr[:-1]
+        # Leaves are kept on a stack, nodes removed after being pushed are
+        # skipped when popped. Degree of a node drops to one at most once,
+        # so each node is pushed at most once.
+        leaves = self._get_leaves()
+        self.leaves_buf = np.empty(self._M + 2, dtype=np.int32)
+        self.leaves_buf[:len(leaves)] = leaves
+        self.leaves_top = len(leaves) - 1
+
+    @property
+    def nodes(self) -> set:
+        """
+        Nodes of graph, derived from `alive`.
 
-        self.leaves = self._get_leaves()
+            Returns
+            -------
+                set of nodes still present in graph
+        """
+        return set(np.flatnonzero(self.alive).tolist())
 
-    def _read_neighbors(self, input: TextIOWrapper) -> list:
+    def _read_neighbors(self, edges: np.ndarray) -> tuple:
         """
-        Reads edges of graph and saves them as sets of neighbors.
+        Reads edges of graph and saves them as neighbor lists in CSR format.
 
-        Each line contains one edge: two nodes it connects.
+        Each pair of consecutive values is one edge: two nodes it connects.
 
             Parameters
             ----------
-                file: TextIOWrapper
-                    input, from which to read edges
+                edges: np.ndarray
+                    flat array of nodes connected by edges
 
             Returns
             -------
-                list of sets of neighbors of each node, list is indexed by nodes
+                tuple (`indptr`, `indices`), neighbors of node `u` are
+                `indices[indptr[u]:indptr[u + 1]]`
         """
-        neighbors = [ set() for _ in range(self._M + 2) ]
+        src = edges[0::2]
+        dst = edges[1::2]
+
+        # Every edge is stored in both directions.
+        ends = np.concatenate((src, dst))
+        others = np.concatenate((dst, src))
 
-        for _ in range(self._M):
-            line = input.readline().strip()
-            u, v = [ int(x) for x in line.split() ]
-            neighbors[u].add(v)
-            neighbors[v].add(u)
+        indptr = np.zeros(self._M + 3, dtype=np.int32)
+        indptr[1:] = np.cumsum(np.bincount(ends, minlength=self._M + 2))
+        indices = others[np.argsort(ends, kind="stable")]
 
-        return neighbors
+        return indptr, indices
 
-    def _read_colors(self, input: TextIOWrapper) -> list:
+    def _read_colors(self, red_leaves: np.ndarray, blue_leaves: np.ndarray) -> np.ndarray:
         """
         Reads colors of nodes and colors appropriate nodes.
 
-        Red nodes are on the first line separated by space,
-        blue nodes are on the second line in the same format.
-
             Parameters
             ----------
-                file: TextIOWrapper
-                    input, from which to read nodes colored red and blue
-
+                red_leaves: np.ndarray
+                    nodes colored red
+                blue_leaves: np.ndarray
+                    nodes colored blue
 
             Returns
             -------
-                list of colors of nodes, list is indexed by nodes
+                array of colors of nodes, array is indexed by nodes
         """
-        colors = [NONE] * len(self.neighbors)
-        
-        line = input.readline().strip()
-        red_leaves = [ int(x) for x in line.split() ]
-        for leaf in red_leaves:
-            colors[leaf] = RED
-
-        line = input.readline().strip()
-        blue_leaves = [ int(x) for x in line.split() ]
-        for leaf in blue_leaves:
-            colors[leaf] = BLUE
+        colors = np.full(len(self.alive), NONE, dtype=np.int8)
+        colors[red_leaves] = RED
+        colors[blue_leaves] = BLUE
 
         return colors
 
-    def _get_leaves(self) -> set:
+    def _get_leaves(self) -> np.ndarray:
         """
         Finds all leaves of graph.
 
             Returns
             -------
-                set of leaves of graph
+                array of leaves of graph
         """
-        leaves = set([ v for v, nbrs in enumerate(self.neighbors) if len(nbrs) == 1 ])
-        return leaves
+        return np.flatnonzero(self.degree == 1)
+
+    def _neighbors(self, node: int) -> np.ndarray:
+        """
+        Returns live neighbors of given node.
+
+            Parameters
+            ----------
+                node: int
+                    node, whose neighbors are returned
+
+            Returns
+            -------
+                view into `indices` containing neighbors of `node`
+        """
+        start = self.indptr[node]
+        return self.indices[start:start + self.degree[node]]
+
+    def _unlink(self, node: int, neighbor: int) -> None:
+        """
+        Removes `neighbor` from neighbors of `node`.
+
+        Removed neighbor is swapped with the last live neighbor of `node`,
+        so that live neighbors stay contiguous.
+
+            Parameters
+            ----------
+                node: int
+                    node, whose neighbor is to be removed
+                neighbor: int
+                    neighbor of `node` to be removed
 
-    def _remove_node(self, node: int) -> None:
+            Returns
+            -------
+                None
+        """
+        indices = self.indices
+        start = int(self.indptr[node])
+        last = start + int(self.degree[node]) - 1
+        i = start + indices[start:last + 1].tolist().index(neighbor)
+        indices[i] = indices[last]
+        indices[last] = neighbor
+        self.degree[node] -= 1
+
+    def _remove_node(self, node: int) -> list:
         """
         Removes given node from graph.
 
@@ -138,16 +240,69 @@ class Graph:
 
             Returns
             -------
-                None
+                list of neighbors of `node`, which became leaves
+        """
+        leaves = []
+        for neighbor in self._neighbors(node).tolist():
+            self._unlink(neighbor, node)
+            if self.degree[neighbor] == 1:
+                leaves.append(neighbor)
+
+        self.degree[node] = 0
+        self.alive[node] = False
+        return leaves
+
+    def _remove_leaf(self, leaf: int, neighbor: int) -> bool:
+        """
+        Removes given leaf from graph.
+
+        Faster alternative to `_remove_node` for nodes with exactly one neighbor.
+
+            Parameters
+            ----------
+                leaf: int
+                    leaf to be removed from graph
+                neighbor: int
+                    the only neighbor of `leaf`
+
+            Returns
+            -------
+                True if `neighbor` became a leaf
+        """
+        self._unlink(neighbor, leaf)
+        self.degree[leaf] = 0
+        self.alive[leaf] = False
+        return self.degree[neighbor] == 1
+
+    def _remove_edge_endpoints(self, leaf: int, neighbor: int) -> list:
         """
-        for neighbor in self.neighbors[node]:
-            self.neighbors[neighbor].remove(node)
-            if len(self.neighbors[neighbor]) == 1:
-                self.leaves.add(neighbor)
+        Removes given leaf and its neighbor from graph.
+
+        Neighbors of `neighbor` are walked only once, `leaf` does not need
+        to be unlinked from `neighbor` first as both are removed.
+
+            Parameters
+            ----------
+                leaf: int
+                    leaf to be removed from graph
+                neighbor: int
+                    the only neighbor of `leaf`, to be removed from graph
 
-        self.neighbors[node].clear()
-        self.nodes.remove(node)
-        self.leaves.discard(node)
+            Returns
+            -------
+                list of neighbors of `neighbor`, which became leaves
+        """
+        leaves = []
+        for node in self._neighbors(neighbor).tolist():
+            if node != leaf:
+                self._unlink(node, neighbor)
+                if self.degree[node] == 1:
+                    leaves.append(node)
+
+        for node in (leaf, neighbor):
+            self.degree[node] = 0
+            self.alive[node] = False
+        return leaves
 
     def _path_found(self, u: int, v: int) -> bool:
         """
@@ -165,9 +320,8 @@ class Graph:
             -------
                 True if path from red to blue node exists using edge (`u`, `v`)
         """
-        return  self.colors[u] != NONE and \
-                self.colors[v] != NONE and \
-                self.colors[u] != self.colors[v]
+        # Only red and blue nodes sum up to `RED + BLUE`.
+        return self.colors[u] + self.colors[v] == RED + BLUE
 
     def _push_color(self, leaf: int, node: int) -> None:
         """
@@ -202,37 +356,87 @@ class Graph:
                 number of paths connecting maximum number of pairs
 
         """
+        if verbose:
+            return self._count_paths_py(verbose)
+
+        if count_paths_c is not None:
+            # Typed memory views do not accept boolean buffers.
+            alive = self.alive.view(np.int8)
+            return count_paths_c(self.indptr, self.indices, self.degree, self.colors, alive)
+
+        count = _count_paths_np if njit is None else _count_paths_nb
+        return int(count(self.indptr, self.indices, self.degree, self.colors, self.alive))
+
+    def _count_paths_py(self, verbose: bool = False) -> int:
+        """
+        Counts paths by reducing leaves one by one in pure Python.
+
+        The same reduction is implemented by `_count_paths_nb`, `_count_paths_lists`
+        and `count_paths_c` in `_count_paths.pyx`, keep them in sync.
+
+            Parameters
+            ----------
+                verbose: bool
+                    whether to print information during each step
+
+            Returns
+            -------
+                number of paths connecting maximum number of pairs
+        """
+        # Attributes and methods used in the loop are bound to locals
+        # to save attribute lookups in each step.
+        leaves = self.leaves_buf
+        alive = self.alive
+        indptr = self.indptr
+        indices = self.indices
+        degree = self.degree
+        remove_node = self._remove_node
+        remove_leaf = self._remove_leaf
+        remove_edge_endpoints = self._remove_edge_endpoints
+        path_found = self._path_found
+        push_color = self._push_color
+
+        top = self.leaves_top
+
         paths = 0
-        while len(self.leaves) > 0:
-            leaf = self.leaves.pop()
-            
+        while top >= 0:
+            leaf = int(leaves[top])
+            top -= 1
+            if not alive[leaf]:
+                continue
+
             if verbose:
                 self._print_leaf(leaf)
 
-            if len(self.neighbors[leaf]) == 0:
+            if degree[leaf] == 0:
                 # Leaf is isolated, just remove it and continue with next leaf.
-                self._remove_node(leaf)
+                remove_node(leaf)
                 
                 if verbose:
                     self._print_graph()
                     self._print_paths(paths)
                 continue
 
-            neighbor = next(iter(self.neighbors[leaf]))
-            self._remove_node(leaf)
+            neighbor = int(indices[indptr[leaf]])
 
-            if self._path_found(leaf, neighbor):
+            if path_found(leaf, neighbor):
                 # There was a path found using edge (`leaf`, `neighbor`).
                 paths += 1
-                self._remove_node(neighbor)
+                for node in remove_edge_endpoints(leaf, neighbor):
+                    top += 1
+                    leaves[top] = node
             else:
                 # There is not a path, push leaf's color to neighbor.
-                self._push_color(leaf, neighbor)
+                if remove_leaf(leaf, neighbor):
+                    top += 1
+                    leaves[top] = neighbor
+                push_color(leaf, neighbor)
 
             if verbose:
                 self._print_graph()
                 self._print_paths(paths)
 
+        self.leaves_top = top
         return paths
 
     def _print_leaf(self, leaf: int) -> None:
@@ -258,24 +462,21 @@ class Graph:
             -------
                 None
         """
-        M = 0
-        R = []
-        B = []
-        edges = ""
-        for u, nbrs in enumerate(self.neighbors):
-            if u in self.nodes:
-                if self.colors[u] == RED:
-                    R.append(str(u))
-                elif self.colors[u] == BLUE:
-                    B.append(str(u))
-            for v in nbrs:
-                if v > u:
-                    edges += f"{u} {v}\n"
-                    M += 1
+        alive = self.alive.tolist()
+        colors = self.colors.tolist()
+        R = [ str(u) for u, color in enumerate(colors) if alive[u] and color == RED ]
+        B = [ str(u) for u, color in enumerate(colors) if alive[u] and color == BLUE ]
+        edges = [
+            f"{u} {v}"
+            for u in range(len(alive))
+            for v in self._neighbors(u).tolist()
+            if v > u
+        ]
+        M = len(edges)
         print(f"{M} {len(R)} {len(B)}")
 
         if M > 0:
-            print(edges[:-1])
+            print("\n".join(edges))
         else:
             print("No edges")
 
@@ -303,6 +504,321 @@ class Graph:
         print("--------------------------------------")
 
 
+def _jit(signature: str):
+    """
+    Compiles decorated function with Numba, returns it unchanged if Numba is not available.
+
+        Parameters
+        ----------
+            signature: str
+                Numba signature of decorated function
+
+        Returns
+        -------
+            decorator compiling given function
+    """
+    def decorator(func):
+        if njit is None:
+            return func
+        return njit(signature, cache=True, boundscheck=False)(func)
+    return decorator
+
+
+@_jit("void(i4[:], i4[:], i4[:], i4, i4)")
+def _unlink_nb(indptr, indices, degree, node, neighbor):
+    """
+    Compiled counterpart of `Graph._unlink`.
+    """
+    start = indptr[node]
+    last = start + degree[node] - 1
+    for i in range(start, last + 1):
+        if indices[i] == neighbor:
+            indices[i] = indices[last]
+            indices[last] = neighbor
+            break
+    degree[node] -= 1
+
+
+@_jit("i4(i4[:], i4[:], i4[:], i1[:], b1[:])")
+def _count_paths_nb(indptr, indices, degree, colors, alive):
+    """
+    Compiled counterpart of `Graph._count_paths_py`.
+
+    Leaves are kept on a preallocated stack. Every node is pushed at most once,
+    either initially or when its degree drops to one, nodes removed in the
+    meantime are skipped when popped.
+
+    Keep in sync with `Graph._count_paths_py`, `_count_paths_lists`
+    and `count_paths_c` in `_count_paths.pyx`.
+
+        Parameters
+        ----------
+            indptr: np.ndarray
+                offsets of neighbor lists in `indices`
+            indices: np.ndarray
+                concatenated neighbor lists of all nodes
+            degree: np.ndarray
+                number of live neighbors of each node
+            colors: np.ndarray
+                color of each node
+            alive: np.ndarray
+                mask of nodes present in graph
+
+        Returns
+        -------
+            number of paths connecting maximum number of pairs
+    """
+    leaves = np.empty(len(degree), np.int32)
+    initial = np.flatnonzero(degree == 1)
+    leaves[:len(initial)] = initial
+    top = len(initial) - 1
+
+    paths = 0
+    while top >= 0:
+        leaf = leaves[top]
+        top -= 1
+        if not alive[leaf]:
+            continue
+
+        alive[leaf] = False
+        if degree[leaf] == 0:
+            # Leaf is isolated, just remove it and continue with next leaf.
+            continue
+
+        neighbor = indices[indptr[leaf]]
+        degree[leaf] = 0
+
+        if colors[leaf] + colors[neighbor] == RED + BLUE:
+            # There was a path found using edge (`leaf`, `neighbor`).
+            paths += 1
+            start = indptr[neighbor]
+            for i in range(start, start + degree[neighbor]):
+                nbr = indices[i]
+                if nbr != leaf:
+                    _unlink_nb(indptr, indices, degree, nbr, neighbor)
+                    if degree[nbr] == 1:
+                        top += 1
+                        leaves[top] = nbr
+            degree[neighbor] = 0
+            alive[neighbor] = False
+        else:
+            _unlink_nb(indptr, indices, degree, neighbor, leaf)
+            if degree[neighbor] == 1:
+                top += 1
+                leaves[top] = neighbor
+            # There is not a path, push leaf's color to neighbor.
+            if colors[leaf] != NONE:
+                colors[neighbor] = colors[leaf]
+
+    return paths
+
+
+def _gather_neighbors(indptr: np.ndarray, indices: np.ndarray, degree: np.ndarray, nodes: np.ndarray) -> tuple:
+    """
+    Gathers live neighbors of all given nodes at once.
+
+        Parameters
+        ----------
+            indptr: np.ndarray
+                offsets of neighbor lists in `indices`
+            indices: np.ndarray
+                concatenated neighbor lists of all nodes
+            degree: np.ndarray
+                number of live neighbors of each node
+            nodes: np.ndarray
+                nodes, whose neighbors are gathered
+
+        Returns
+        -------
+            tuple (`positions`, `segments`), positions of neighbors in `indices`
+            and index into `nodes` of the node each neighbor belongs to
+    """
+    lengths = degree[nodes]
+    offsets = np.cumsum(lengths) - lengths
+    positions = np.arange(lengths.sum()) + np.repeat(indptr[nodes] - offsets, lengths)
+    segments = np.repeat(np.arange(len(nodes)), lengths)
+    return positions, segments
+
+
+def _count_paths_lists(indptr, indices, degree, colors, alive, leaves):
+    """
+    Counterpart of `_count_paths_nb` in pure Python.
+
+    Nodes still present in graph are renumbered and copied to Python lists,
+    which are much faster to index than NumPy arrays outside of compiled code.
+    Graph is then reduced leaf by leaf and arrays are updated in the end.
+
+    Keep in sync with `Graph._count_paths_py`, `_count_paths_nb`
+    and `count_paths_c` in `_count_paths.pyx`.
+
+        Parameters
+        ----------
+            indptr: np.ndarray
+                offsets of neighbor lists in `indices`
+            indices: np.ndarray
+                concatenated neighbor lists of all nodes
+            degree: np.ndarray
+                number of live neighbors of each node
+            colors: np.ndarray
+                color of each node
+            alive: np.ndarray
+                mask of nodes present in graph
+            leaves: np.ndarray
+                current leaves of graph
+
+        Returns
+        -------
+            number of paths connecting maximum number of pairs
+    """
+    nodes = np.flatnonzero(alive)
+    renumbered = np.zeros(len(alive), dtype=np.int64)
+    renumbered[nodes] = np.arange(len(nodes))
+    positions, _ = _gather_neighbors(indptr, indices, degree, nodes)
+
+    lengths = degree[nodes]
+    starts = (np.cumsum(lengths) - lengths).tolist()
+    nbrs = renumbered[indices[positions]].tolist()
+    degrees = lengths.tolist()
+    node_colors = colors[nodes].tolist()
+    present = [True] * len(nodes)
+    stack = renumbered[leaves].tolist()
+
+    def unlink(node, neighbor):
+        start = starts[node]
+        last = start + degrees[node] - 1
+        i = start + nbrs[start:last + 1].index(neighbor)
+        nbrs[i] = nbrs[last]
+        nbrs[last] = neighbor
+        degrees[node] -= 1
+
+    paths = 0
+    while stack:
+        leaf = stack.pop()
+        if not present[leaf]:
+            continue
+
+        present[leaf] = False
+        if degrees[leaf] == 0:
+            # Leaf is isolated, just remove it and continue with next leaf.
+            continue
+
+        neighbor = nbrs[starts[leaf]]
+        degrees[leaf] = 0
+
+        if node_colors[leaf] + node_colors[neighbor] == RED + BLUE:
+            # There was a path found using edge (`leaf`, `neighbor`).
+            paths += 1
+            start = starts[neighbor]
+            for nbr in nbrs[start:start + degrees[neighbor]]:
+                if nbr != leaf:
+                    unlink(nbr, neighbor)
+                    if degrees[nbr] == 1:
+                        stack.append(nbr)
+            degrees[neighbor] = 0
+            present[neighbor] = False
+        else:
+            unlink(neighbor, leaf)
+            if degrees[neighbor] == 1:
+                stack.append(neighbor)
+            # There is not a path, push leaf's color to neighbor.
+            if node_colors[leaf] != NONE:
+                node_colors[neighbor] = node_colors[leaf]
+
+    indices[positions] = nodes[nbrs]
+    degree[nodes] = degrees
+    colors[nodes] = node_colors
+    alive[nodes] = present
+    return paths
+
+
+def _count_paths_np(indptr, indices, degree, colors, alive):
+    """
+    Vectorized counterpart of `Graph._count_paths_py`.
+
+    All current leaves are reduced at once in each step. Leaves sharing
+    a neighbor are reduced together: their neighbor is part of a path if
+    red and blue color meet on it, otherwise it takes the only color present.
+    Two leaves connected to each other form a path if they have different colors.
+    Neighbors of removed nodes are then compacted in one pass.
+
+    Each step costs a fixed number of array operations, so once the front
+    drops below `MIN_FRONT` leaves (e.g. on long chains), the rest of graph
+    is reduced leaf by leaf by `_count_paths_lists`.
+
+        Parameters
+        ----------
+            indptr: np.ndarray
+                offsets of neighbor lists in `indices`
+            indices: np.ndarray
+                concatenated neighbor lists of all nodes
+            degree: np.ndarray
+                number of live neighbors of each node
+            colors: np.ndarray
+                color of each node
+            alive: np.ndarray
+                mask of nodes present in graph
+
+        Returns
+        -------
+            number of paths connecting maximum number of pairs
+    """
+    paths = 0
+    front = np.flatnonzero(alive & (degree == 1))
+    while len(front) >= MIN_FRONT:
+        # Isolated leaves are just removed.
+        alive[front[degree[front] == 0]] = False
+        front = front[degree[front] == 1]
+        nbrs = indices[indptr[front]]
+
+        # Leaves connected to each other, each pair is counted once.
+        paired = degree[nbrs] == 1
+        first = paired & (front < nbrs)
+        paths += int(np.count_nonzero(colors[front[first]] + colors[nbrs[first]] == RED + BLUE))
+        alive[front[paired]] = False
+
+        # Other leaves grouped by their neighbor.
+        order = np.argsort(nbrs[~paired], kind="stable")
+        grouped = front[~paired][order]
+        centers, starts = np.unique(nbrs[~paired][order], return_index=True)
+        red = colors[centers] == RED
+        blue = colors[centers] == BLUE
+        if len(grouped) > 0:
+            red |= np.logical_or.reduceat(colors[grouped] == RED, starts)
+            blue |= np.logical_or.reduceat(colors[grouped] == BLUE, starts)
+        found = red & blue
+        paths += int(np.count_nonzero(found))
+
+        kept = centers[~found]
+        colors[kept[red[~found]]] = RED
+        colors[kept[blue[~found]]] = BLUE
+
+        removed = centers[found]
+        alive[grouped] = False
+        alive[removed] = False
+
+        # Compact neighbor lists of nodes, which lost a neighbor.
+        positions, _ = _gather_neighbors(indptr, indices, degree, removed)
+        touched = np.unique(np.concatenate((kept, indices[positions])))
+        touched = touched[alive[touched]]
+        degree[front] = 0
+        degree[removed] = 0
+
+        positions, segments = _gather_neighbors(indptr, indices, degree, touched)
+        values = indices[positions]
+        live = alive[values]
+        lengths = np.bincount(segments[live], minlength=len(touched)).astype(np.int32)
+        ranks = np.cumsum(live) - 1 - np.repeat(np.cumsum(lengths) - lengths, degree[touched])
+        indices[indptr[touched][segments[live]] + ranks[live]] = values[live]
+        degree[touched] = lengths
+
+        front = touched[lengths <= 1]
+
+    if len(front) > 0:
+        paths += _count_paths_lists(indptr, indices, degree, colors, alive, front)
+
+    return paths
+
+
 def main(args: argparse.Namespace):
     graph = Graph(args.file)
     print(graph.count_paths(args.verbose))